@@ -11,19 +11,171 @@ import sys
 import argparse
 import zipfile
 import io
+import mmap
+import shutil
+import tempfile
 import traceback
+import logging
+from contextlib import contextmanager
 from pathlib import Path
 
+# 配置日志
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(message)s',
+    stream=sys.stdout
+)
+logger = logging.getLogger("excel_image_extractor")
+
 # 检查是否安装了PIL库
 try:
     from PIL import Image
     HAS_PIL = True
 except ImportError:
     HAS_PIL = False
-    print("警告: PIL/Pillow库未安装，某些图像验证功能将被禁用")
+    logger.warning("警告: PIL/Pillow库未安装，某些图像验证功能将被禁用")
+
+# 流式复制ZIP条目时使用的缓冲区大小
+COPY_BUFFER_SIZE = 1 << 20
+# PIL识别图像格式时读取的文件头大小
+IMAGE_HEADER_SIZE = 64 * 1024
+# 超过该大小（MB）的Excel文件通过内存映射读取
+MMAP_THRESHOLD_MB = 10
+
+# 常见图像格式的文件头签名
+IMAGE_MAGICS = {
+    b'\x89PNG\r\n\x1a\n': 'png',
+    b'\xff\xd8\xff': 'jpg',
+    b'GIF87a': 'gif',
+    b'GIF89a': 'gif',
+    b'BM': 'bmp',
+    b'II*\x00': 'tiff',
+    b'MM\x00*': 'tiff',
+}
+MAGIC_HEADER_SIZE = 16
+
+# 图像候选条目的优先级：标准媒体目录 > 图像扩展名 > 名称启发式（需PIL检测）
+PRIORITY_STANDARD_MEDIA = 0
+PRIORITY_IMAGE_EXTENSION = 1
+PRIORITY_HEURISTIC = 2
+PRIORITY_ORDER = (PRIORITY_STANDARD_MEDIA, PRIORITY_IMAGE_EXTENSION, PRIORITY_HEURISTIC)
+
+STANDARD_MEDIA_PREFIX = 'xl/media/'
+STANDARD_MEDIA_DIRS = ('/ppt/media/', '/word/media/')
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.emf', '.wmf')
+HEURISTIC_KEYWORDS = ('drawings', 'image', 'media')
+
+
+class _MappedFile(mmap.mmap):
+    """补充zipfile读取条目时需要的seekable()（Python 3.13之前的mmap没有该方法）"""
+    
+    def seekable(self):
+        return True
+
+
+@contextmanager
+def _open_excel_archive(excel_path, file_size_mb):
+    """
+    以ZIP压缩包方式打开Excel文件。
+    
+    大文件通过mmap映射到内存，中央目录的查找和各条目的读取都直接访问页缓存，
+    在网络文件系统上可以避免每次seek都产生一次往返。
+    """
+    if file_size_mb <= MMAP_THRESHOLD_MB:
+        with zipfile.ZipFile(excel_path, 'r', allowZip64=True) as zip_ref:
+            yield zip_ref
+        return
+    
+    with open(excel_path, 'rb') as f:
+        # 提示内核按顺序预读
+        if hasattr(os, 'posix_fadvise'):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        with _MappedFile(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with zipfile.ZipFile(mm, 'r', allowZip64=True) as zip_ref:
+                yield zip_ref
+
+
+def _copy_zip_entry(zip_ref, member, output_path):
+    """将ZIP条目以流的方式写入磁盘，避免整个条目解压到内存中"""
+    with zip_ref.open(member) as src, open(output_path, 'wb') as dst:
+        shutil.copyfileobj(src, dst, COPY_BUFFER_SIZE)
+
+
+def _extract_numbered_images(zip_ref, members, output_dir, image_count):
+    """
+    将一组图像条目保存到输出目录，文件名加上序号前缀，返回更新后的图像计数。
+    
+    每个条目先用ZipFile.extract解压到输出目录下的临时目录，再重命名为
+    "{序号}_{文件名}"（同一文件系统内重命名只修改元数据）。
+    只重命名extract返回的路径（已清理..和绝对路径），不使用原始条目名拼接路径。
+    解压失败时退回到逐个条目流式复制。
+    """
+    if not members:
+        return image_count
+    
+    with tempfile.TemporaryDirectory(dir=output_dir) as staging_dir:
+        staging_root = os.path.realpath(staging_dir)
+        for info in members:
+            try:
+                image_count += 1
+                image_filename = os.path.basename(info.filename)
+                output_path = os.path.join(output_dir, f"{image_count}_{image_filename}")
+                try:
+                    staged_path = os.path.realpath(zip_ref.extract(info, staging_dir))
+                except Exception as e:
+                    logger.error("解压图像 %s 到临时目录时出错，改为流式复制: %s", info.filename, e)
+                    staged_path = None
+                
+                if (staged_path and os.path.isfile(staged_path)
+                        and os.path.commonpath([staging_root, staged_path]) == staging_root):
+                    os.replace(staged_path, output_path)
+                else:
+                    # 将图像流式保存到输出目录
+                    _copy_zip_entry(zip_ref, info, output_path)
+                
+                logger.info("已保存图像 %d: %s", image_count, output_path)
+            except Exception as e:
+                logger.error("提取图像 %s 时出错: %s", info.filename, e)
+    
+    return image_count
 
 
-def extract_images_using_zipfile(excel_path, output_dir):
+def _detect_image_format(zip_ref, member):
+    """
+    根据文件头判断ZIP条目是否为图像，返回图像格式的扩展名，不是图像时返回None。
+    
+    先比较前16字节的文件头签名；签名无法识别时，如果安装了PIL，
+    再读取更多文件头交给PIL识别（只解析文件头，不解码像素）。
+    """
+    with zip_ref.open(member) as src:
+        header = src.read(MAGIC_HEADER_SIZE)
+        for magic, image_format in IMAGE_MAGICS.items():
+            if header.startswith(magic):
+                return image_format
+        
+        if not HAS_PIL:
+            return None
+        header += src.read(IMAGE_HEADER_SIZE - len(header))
+    
+    try:
+        img = Image.open(io.BytesIO(header))
+    except Exception:
+        return None
+    return img.format.lower() if img.format else 'png'
+
+
+def _classify_entry(name, lower_name):
+    """返回ZIP条目作为图像候选的优先级，不是候选时返回None"""
+    if name.startswith(STANDARD_MEDIA_PREFIX) or any(d in name for d in STANDARD_MEDIA_DIRS):
+        return PRIORITY_STANDARD_MEDIA
+    if name.endswith(IMAGE_EXTENSIONS):
+        return PRIORITY_IMAGE_EXTENSION
+    if any(keyword in lower_name for keyword in HEURISTIC_KEYWORDS):
+        return PRIORITY_HEURISTIC
+    return None
+
+
+def extract_images_using_zipfile(excel_path, output_dir, verbose=False):
     """
     Extract images from Excel file by treating it as a zip archive.
     Excel files (.xlsx) are actually zip archives with XML and binary files inside.
@@ -31,138 +183,116 @@ def extract_images_using_zipfile(excel_path, output_dir):
     Args:
         excel_path (str): Path to the Excel file
         output_dir (str): Directory to save extracted images
+        verbose (bool): Also compute and log archive/output listings (logged at INFO, so they
+            show up without changing the logger level)
     
     Returns:
         int: Number of images extracted
     """
     # 检查文件是否存在
     if not os.path.exists(excel_path):
-        print(f"错误: 找不到Excel文件: {excel_path}")
+        logger.error("错误: 找不到Excel文件: %s", excel_path)
         return 0
         
     # 打印文件大小信息
     file_size_mb = os.path.getsize(excel_path) / (1024 * 1024)
-    print(f"Excel文件大小: {file_size_mb:.2f} MB")
+    logger.info("Excel文件大小: %.2f MB", file_size_mb)
 
     # 创建输出目录（如果不存在）
     try:
         os.makedirs(output_dir, exist_ok=True)
-        print(f"输出目录已创建/确认: {output_dir}")
+        logger.info("输出目录已创建/确认: %s", output_dir)
     except Exception as e:
-        print(f"创建输出目录时出错: {str(e)}")
+        logger.error("创建输出目录时出错: %s", e)
         return 0
     
-    print(f"正在打开Excel文件作为zip压缩包: {excel_path}")
+    logger.info("正在打开Excel文件作为zip压缩包: %s", excel_path)
     
     image_count = 0
     
     try:
         # 打开Excel文件作为ZIP压缩包
-        with zipfile.ZipFile(excel_path, 'r') as zip_ref:
-            # 列出压缩包中的所有文件
-            all_files = zip_ref.namelist()
-            print(f"Excel压缩包中的文件总数: {len(all_files)}")
-            print(f"压缩包中的前20个文件:")
-            for i, file in enumerate(all_files):
-                if i < 20:  # 显示前20个文件以进行调试
-                    print(f"  - {file}")
+        with _open_excel_archive(excel_path, file_size_mb) as zip_ref:
+            # 列出压缩包中的所有文件，并在同一次遍历中完成分类
+            all_infos = zip_ref.infolist()
+            logger.info("Excel压缩包中的文件总数: %d", len(all_infos))
+            if verbose:
+                # 显示前20个文件以进行调试，合并为一条日志输出
+                logger.info("压缩包中的前20个文件:\n%s", "\n".join(f"  - {info.filename}" for info in all_infos[:20]))
             
-            # 搜索媒体文件
-            media_files = [f for f in all_files if 'media' in f.lower()]
-            print(f"找到 {len(media_files)} 个可能的媒体文件")
+            # 每个条目只归入优先级最高的一类，避免同一文件被重复提取
+            candidates = {priority: [] for priority in PRIORITY_ORDER}
+            media_count = 0
+            for info in all_infos:
+                lower_name = info.filename.lower()
+                if 'media' in lower_name:
+                    media_count += 1
+                if info.is_dir() or info.file_size == 0:
+                    continue
+                priority = _classify_entry(info.filename, lower_name)
+                if priority is not None:
+                    candidates[priority].append(info)
+            logger.debug("找到 %d 个可能的媒体文件", media_count)
             
             # 首先检查标准位置的图像文件
-            print("第一遍: 检查标准媒体文件夹...")
-            for file in all_files:
-                # 检查图像文件（Excel中常见的图像文件扩展名）
-                if file.startswith('xl/media/') or '/ppt/media/' in file or '/word/media/' in file:
+            logger.info("第一遍: 检查标准媒体文件夹...")
+            image_count = _extract_numbered_images(
+                zip_ref, candidates[PRIORITY_STANDARD_MEDIA], output_dir, image_count)
+            
+            if image_count == 0:
+                logger.info("在标准媒体文件夹中未找到图像。正在搜索其他潜在图像文件...")
+                
+                # 第二遍查找任何类似图像的文件
+                logger.info("第二遍: 检查图像扩展名...")
+                image_count = _extract_numbered_images(
+                    zip_ref, candidates[PRIORITY_IMAGE_EXTENSION], output_dir, image_count)
+            
+            # 第三遍尝试检测图像二进制数据（仅在前两遍都没有结果时）
+            if image_count == 0:
+                logger.info("第三遍: 根据文件头检测图像内容...")
+                for info in candidates[PRIORITY_HEURISTIC]:
                     try:
-                        image_count += 1
-                        image_filename = os.path.basename(file)
-                        # 获取图像数据
-                        image_data = zip_ref.read(file)
+                        image_format = _detect_image_format(zip_ref, info)
+                        if image_format is None:
+                            # 不是可识别的图像，跳过
+                            continue
                         
-                        # 将图像保存到输出目录
-                        output_path = os.path.join(output_dir, f"{image_count}_{image_filename}")
+                        image_count += 1
+                        output_path = os.path.join(output_dir, f"{image_count}_detected_image.{image_format}")
                         
-                        with open(output_path, 'wb') as f:
-                            f.write(image_data)
+                        # 确认是图像后重新打开条目并流式复制
+                        _copy_zip_entry(zip_ref, info, output_path)
                         
-                        print(f"已保存图像 {image_count}: {output_path}")
+                        logger.info("已保存检测到的图像 %d: %s", image_count, output_path)
                     except Exception as e:
-                        print(f"提取图像 {file} 时出错: {str(e)}")
-            
-            if image_count == 0:
-                print("在标准媒体文件夹中未找到图像。正在搜索其他潜在图像文件...")
-                
-                # 第二遍查找任何类似图像的文件
-                print("第二遍: 检查图像扩展名...")
-                for file in all_files:
-                    if any(file.endswith(ext) for ext in ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.emf', '.wmf']):
-                        try:
-                            image_count += 1
-                            image_filename = os.path.basename(file)
-                            # 获取图像数据
-                            image_data = zip_ref.read(file)
-                            
-                            # 将图像保存到输出目录
-                            output_path = os.path.join(output_dir, f"{image_count}_{image_filename}")
-                            
-                            with open(output_path, 'wb') as f:
-                                f.write(image_data)
-                            
-                            print(f"已保存图像 {image_count}: {output_path}")
-                        except Exception as e:
-                            print(f"提取图像 {file} 时出错: {str(e)}")
-                
-                # 第三遍尝试检测图像二进制数据
-                if HAS_PIL:
-                    print("第三遍: 使用PIL尝试检测图像内容...")
-                    for file in all_files:
-                        if 'drawings' in file.lower() or 'image' in file.lower() or 'media' in file.lower():
-                            try:
-                                image_data = zip_ref.read(file)
-                                # 尝试打开为图像以验证
-                                img = Image.open(io.BytesIO(image_data))
-                                img.verify()  # 验证它是有效的图像
-                                
-                                image_count += 1
-                                output_path = os.path.join(output_dir, f"{image_count}_detected_image.{img.format.lower() if img.format else 'png'}")
-                                
-                                with open(output_path, 'wb') as f:
-                                    f.write(image_data)
-                                
-                                print(f"已保存检测到的图像 {image_count}: {output_path}")
-                            except Exception as e:
-                                # 不是有效的图像，跳过
-                                pass
+                        logger.error("提取图像 %s 时出错: %s", info.filename, e)
 
             # 确认打印
             if image_count > 0:
-                print(f"总共提取了 {image_count} 张图像，保存到: {output_dir}")
+                logger.info("总共提取了 %d 张图像，保存到: %s", image_count, output_dir)
             else:
-                print(f"在Excel文件中未找到任何图像。")
-                # 打印出找到的文件类型以供参考
-                extensions = set(os.path.splitext(f)[1] for f in all_files if '.' in f)
-                print(f"Excel压缩包中的文件扩展名: {', '.join(extensions)}")
+                logger.info("在Excel文件中未找到任何图像。")
+                if verbose:
+                    # 打印出找到的文件类型以供参考
+                    extensions = set(os.path.splitext(info.filename)[1] for info in all_infos if '.' in info.filename)
+                    logger.info("Excel压缩包中的文件扩展名: %s", ', '.join(extensions))
     
     except zipfile.BadZipFile:
-        print(f"错误: 文件 {excel_path} 不是有效的zip文件或Excel文件。")
+        logger.error("错误: 文件 %s 不是有效的zip文件或Excel文件。", excel_path)
         return 0
     except Exception as e:
-        print(f"提取图像时出现错误: {str(e)}")
-        print("详细错误信息:")
-        traceback.print_exc()
+        logger.error("提取图像时出现错误: %s", e)
+        logger.error("详细错误信息:\n%s", traceback.format_exc())
         return 0
     
-    print(f"从 {excel_path} 提取了 {image_count} 张图像")
+    logger.info("从 %s 提取了 %d 张图像", excel_path, image_count)
     
     # 确认输出目录中的文件
-    if os.path.exists(output_dir):
+    if verbose and os.path.exists(output_dir):
         files_in_output = os.listdir(output_dir)
-        print(f"输出目录 {output_dir} 中有 {len(files_in_output)} 个文件")
+        logger.info("输出目录 %s 中有 %d 个文件", output_dir, len(files_in_output))
         if len(files_in_output) > 0:
-            print(f"前几个文件: {', '.join(files_in_output[:5])}")
+            logger.info("前几个文件: %s", ', '.join(files_in_output[:5]))
     
     return image_count
 
@@ -172,25 +302,28 @@ def main():
     parser.add_argument("excel_file", help="Excel文件的路径")
     parser.add_argument("--output", "-o", default="extracted_images", 
                         help="保存提取的图像的目录 (默认: ./extracted_images)")
+    parser.add_argument("--verbose", "-v", action="store_true",
+                        help="输出压缩包内容和输出目录等调试信息")
     
     args = parser.parse_args()
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
     
-    print(f"Python版本: {sys.version}")
-    print(f"当前工作目录: {os.getcwd()}")
+    logger.info("Python版本: %s", sys.version)
+    logger.info("当前工作目录: %s", os.getcwd())
     
     # 转换相对路径为绝对路径
     excel_path = os.path.abspath(args.excel_file)
     output_dir = os.path.abspath(args.output)
     
-    print(f"Excel文件路径: {excel_path}")
-    print(f"输出目录: {output_dir}")
+    logger.info("Excel文件路径: %s", excel_path)
+    logger.info("输出目录: %s", output_dir)
     
     if not os.path.exists(excel_path):
-        print(f"错误: 找不到Excel文件: {excel_path}")
+        logger.error("错误: 找不到Excel文件: %s", excel_path)
         return
     
     # 使用替代方法提取图像
-    extract_images_using_zipfile(excel_path, output_dir)
+    extract_images_using_zipfile(excel_path, output_dir, verbose=args.verbose)
 
 
 if __name__ == "__main__":
@@ -8,9 +8,41 @@ Process Excel data to extract specific columns and remove duplicates based on 
 import os
 import sys
 import argparse
+import numpy as np
 import pandas as pd
 from pathlib import Path
 
+# 检查是否安装了xlsxwriter库（写入速度比openpyxl快）
+try:
+    import xlsxwriter
+    EXCEL_WRITER_ENGINE = 'xlsxwriter'
+except ImportError:
+    EXCEL_WRITER_ENGINE = 'openpyxl'
+
+# 需要提取的列
+REQUIRED_COLUMNS = ['款号', '产品名称', '品目']
+
+def _is_required_column(column):
+    """判断Excel中的列是否需要读取（允许列名带空格或有轻微变化）"""
+    name = str(column).strip()
+    return any(req_col in name for req_col in REQUIRED_COLUMNS)
+
+def _deduplicate_by_key_pair(df, first_key, second_key):
+    """
+    按两列去重，保留首次出现的行。
+    
+    两列先转换为分类编码，再合并成一个int64键去重，避免对Python字符串元组做哈希。
+    唯一值数量超出32位编码范围时退回到drop_duplicates。
+    """
+    first_cat = df[first_key].astype('category').cat
+    second_cat = df[second_key].astype('category').cat
+    if max(len(first_cat.categories), len(second_cat.categories)) >= (1 << 32):
+        return df.drop_duplicates(subset=[first_key, second_key])
+    
+    keys = (first_cat.codes.to_numpy(np.int64) << 32) | (second_cat.codes.to_numpy(np.int64) & 0xFFFFFFFF)
+    mask = ~pd.Index(keys).duplicated()
+    return df.loc[mask]
+
 def process_excel_data(input_file, output_file):
     """
     Process Excel data to extract specific columns and remove duplicates.
@@ -33,27 +65,28 @@ def process_excel_data(input_file, output_file):
         print(f"Excel文件大小: {file_size_mb:.2f} MB")
         
         # Read Excel file
+        # 只解析名称匹配（或包含）所需列名的列，其余列在构建DataFrame之前即被丢弃
         print(f"正在读取Excel文件: {input_file}")
-        df = pd.read_excel(input_file)
-        
-        # Display original dataframe info
-        print(f"原始数据表格尺寸: {df.shape[0]}行 x {df.shape[1]}列")
-        print(f"原始数据列名: {', '.join(df.columns)}")
+        df = pd.read_excel(
+            input_file,
+            engine='openpyxl',
+            sheet_name=0,
+            usecols=_is_required_column,
+            dtype='string'
+        )
         
         # 检查并清理列名中的空格和不可见字符
-        df.columns = [col.strip() for col in df.columns]
-        
-        # 显示清理后的列名
-        print(f"清理后的列名: {', '.join(df.columns)}")
+        df.columns = [str(col).strip() for col in df.columns]
         
-        # Extract only the required columns
-        required_columns = ['款号', '产品名称', '品目']
+        # Display loaded dataframe info
+        print(f"读取的数据表格尺寸: {df.shape[0]}行 x {df.shape[1]}列")
+        print(f"读取的数据列名: {', '.join(df.columns)}")
         
         # 尝试查找列名，即使它们有轻微的变化
         actual_columns = []
         missing_columns = []
         
-        for req_col in required_columns:
+        for req_col in REQUIRED_COLUMNS:
             # 检查精确匹配
             if req_col in df.columns:
                 actual_columns.append(req_col)
@@ -71,21 +104,21 @@ def process_excel_data(input_file, output_file):
             return False
         
         # 重新设置列名映射
-        column_mapping = dict(zip(actual_columns, required_columns))
+        column_mapping = dict(zip(actual_columns, REQUIRED_COLUMNS))
         
         try:
             # 提取所需列
             df_extract = df[actual_columns].copy()
             # 重命名列以确保一致性
             df_extract.rename(columns=column_mapping, inplace=True)
-            print(f"提取了以下列: {', '.join(required_columns)}")
+            print(f"提取了以下列: {', '.join(REQUIRED_COLUMNS)}")
         except KeyError as e:
             print(f"提取列时出错: {str(e)}")
             print("请确保Excel文件包含以下列: '款号', '产品名称', '品目'")
             return False
         
         # Remove duplicates based on '款号' and '产品名称'
-        df_deduplicated = df_extract.drop_duplicates(subset=['款号', '产品名称'])
+        df_deduplicated = _deduplicate_by_key_pair(df_extract, '款号', '产品名称')
         
         # Print deduplication results
         duplicate_count = df_extract.shape[0] - df_deduplicated.shape[0]
@@ -97,7 +130,7 @@ def process_excel_data(input_file, output_file):
         
         # Save to a new Excel file
         print(f"正在保存处理后的数据到: {output_file}")
-        df_deduplicated.to_excel(output_file, index=False)
+        df_deduplicated.to_excel(output_file, index=False, engine=EXCEL_WRITER_ENGINE)
         
         print(f"成功处理Excel数据并保存到: {output_file}")
         return True
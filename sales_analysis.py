@@ -1,10 +1,17 @@
 import pandas as pd
 import numpy as np
+import matplotlib as mpl
+mpl.use('Agg')  # 只输出图片文件，不需要GUI后端
 import matplotlib.pyplot as plt
 import seaborn as sns
 from typing import Dict, Any
 import os
-import matplotlib as mpl
+import sys
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.patches import Rectangle
+from matplotlib.lines import Line2D
+from concurrent.futures import ProcessPoolExecutor
 
 def set_chinese_font():
     """设置中文字体"""
@@ -12,9 +19,35 @@ def set_chinese_font():
     plt.rcParams['axes.unicode_minus'] = False    # 用来正常显示负号
     return None  # 不返回font对象，直接使用全局设置
 
-# 初始化中文字体
+# 使用默认样式并初始化中文字体（全局设置，各绘图函数无需重复设置）
+plt.style.use('default')
 set_chinese_font()
 
+# 分析过程中用到的数据列
+ANALYSIS_COLUMNS = ['date', 'product', 'region', 'city', 'channel',
+                    'total_sales', 'total_cost', 'profit', 'quantity']
+
+# 汇总分析的维度
+ANALYSIS_DIMENSIONS = ['month', 'city', 'region', 'channel', 'product']
+
+def _summarize_dimension(base_analysis: pd.DataFrame, dimension: str) -> pd.DataFrame:
+    """
+    将多维度汇总结果折叠到单个维度
+    
+    参数:
+    base_analysis: 按ANALYSIS_DIMENSIONS分组求和后的DataFrame
+    dimension: 要保留的维度名称
+    
+    返回:
+    该维度的销售额、成本、利润、利润率和销量汇总
+    """
+    summary = base_analysis.groupby(level=dimension, observed=True).sum()
+    # 结果索引还原为原始类型，避免分类索引影响后续绘图和打印
+    summary.index = summary.index.astype(summary.index.categories.dtype)
+    # 利润率按汇总值计算（即按销售额加权的利润率）
+    summary['profit_margin'] = summary['profit'] / summary['total_sales'] * 100
+    return summary[['total_sales', 'total_cost', 'profit', 'profit_margin', 'quantity']]
+
 def analyze_sales_data(df: pd.DataFrame, output_dir: str = "reports") -> Dict[str, Any]:
     """
     对销售数据进行多维度分析
@@ -31,57 +64,37 @@ def analyze_sales_data(df: pd.DataFrame, output_dir: str = "reports") -> Dict[st
         os.makedirs(output_dir)
     
     # 确保date列是datetime类型
-    df['date'] = pd.to_datetime(df['date'])
-    df['month'] = df['date'].dt.strftime('%Y-%m')
-    
-    # 计算关键指标
-    df['profit_margin'] = (df['profit'] / df['total_sales'] * 100).round(2)
-    df['cost_ratio'] = (df['total_cost'] / df['total_sales'] * 100).round(2)
+    # 生成器写出的日期为ISO-8601格式，指定格式可跳过逐行推断，cache对重复日期只解析一次
+    df['date'] = pd.to_datetime(df['date'], format='ISO8601', cache=True)
+    # 直接转换为月精度的datetime64（每月第一天），不生成逐行字符串
+    df['month'] = df['date'].to_numpy().astype('datetime64[M]')
+    
+    # 维度列基数很低，转换为分类类型后分组只需处理整数编码
+    for col in ANALYSIS_DIMENSIONS:
+        df[col] = df[col].astype('category')
+    
+    # 一次分组得到所有维度组合的汇总，各维度的分析结果再由它折叠得到
+    base_analysis = df.groupby(ANALYSIS_DIMENSIONS, observed=True).agg(
+        total_sales=('total_sales', 'sum'),
+        total_cost=('total_cost', 'sum'),
+        profit=('profit', 'sum'),
+        quantity=('quantity', 'sum')
+    )
     
     # 1. 按月度维度分析
-    monthly_analysis = df.groupby('month').agg({
-        'total_sales': 'sum',
-        'total_cost': 'sum',
-        'profit': 'sum',
-        'profit_margin': 'mean',
-        'quantity': 'sum'
-    }).round(2)
+    monthly_analysis = _summarize_dimension(base_analysis, 'month')
     
     # 2. 按城市维度分析
-    city_analysis = df.groupby('city').agg({
-        'total_sales': 'sum',
-        'total_cost': 'sum',
-        'profit': 'sum',
-        'profit_margin': 'mean',
-        'quantity': 'sum'
-    }).round(2).sort_values('total_sales', ascending=False)
+    city_analysis = _summarize_dimension(base_analysis, 'city').sort_values('total_sales', ascending=False)
     
     # 3. 按地区维度分析
-    region_analysis = df.groupby('region').agg({
-        'total_sales': 'sum',
-        'total_cost': 'sum',
-        'profit': 'sum',
-        'profit_margin': 'mean',
-        'quantity': 'sum'
-    }).round(2).sort_values('total_sales', ascending=False)
+    region_analysis = _summarize_dimension(base_analysis, 'region').sort_values('total_sales', ascending=False)
     
     # 4. 按渠道维度分析
-    channel_analysis = df.groupby('channel').agg({
-        'total_sales': 'sum',
-        'total_cost': 'sum',
-        'profit': 'sum',
-        'profit_margin': 'mean',
-        'quantity': 'sum'
-    }).round(2).sort_values('total_sales', ascending=False)
+    channel_analysis = _summarize_dimension(base_analysis, 'channel').sort_values('total_sales', ascending=False)
     
     # 5. 产品分析
-    product_analysis = df.groupby('product').agg({
-        'total_sales': 'sum',
-        'total_cost': 'sum',
-        'profit': 'sum',
-        'profit_margin': 'mean',
-        'quantity': 'sum'
-    }).round(2).sort_values('total_sales', ascending=False)
+    product_analysis = _summarize_dimension(base_analysis, 'product').sort_values('total_sales', ascending=False)
     
     # 创建可视化图表
     create_visualizations(
@@ -93,7 +106,13 @@ def analyze_sales_data(df: pd.DataFrame, output_dir: str = "reports") -> Dict[st
     )
     
     # 创建高级可视化图表
-    create_advanced_visualizations(df, output_dir)
+    create_advanced_visualizations(
+        df,
+        output_dir,
+        product_analysis=product_analysis,
+        city_analysis=city_analysis,
+        channel_analysis=channel_analysis
+    )
     
     return {
         'monthly_analysis': monthly_analysis,
@@ -111,15 +130,10 @@ def create_visualizations(
     output_dir: str
 ):
     """创建销售数据可视化图表"""
-    # 使用默认样式
-    plt.style.use('default')
-    
-    # 确保每个新图表都使用中文字体
-    set_chinese_font()
-    
     # 1. 月度销售趋势图
     plt.figure(figsize=(15, 6))
-    plt.plot(monthly_analysis.index.astype(str), monthly_analysis['total_sales'], marker='o')
+    month_labels = pd.DatetimeIndex(monthly_analysis.index).strftime('%Y-%m')
+    plt.plot(month_labels, monthly_analysis['total_sales'], marker='o')
     plt.title('月度销售趋势')
     plt.xlabel('月份')
     plt.ylabel('销售额')
@@ -129,11 +143,9 @@ def create_visualizations(
     plt.close()
     
     # 2. 地区销售分布图
-    plt.figure(figsize=(10, 6))
-    sns.barplot(data=region_analysis.reset_index(), x='region', y='total_sales')
-    plt.title('各地区销售额分布')
-    plt.xlabel('地区')
-    plt.ylabel('销售额')
+    fig, ax = plt.subplots(figsize=(10, 6))
+    ax.bar(region_analysis.index.to_numpy(), region_analysis['total_sales'].to_numpy())
+    ax.set(title='各地区销售额分布', xlabel='地区', ylabel='销售额')
     plt.tight_layout()
     plt.savefig(os.path.join(output_dir, 'region_sales_distribution.png'))
     plt.close()
@@ -148,121 +160,118 @@ def create_visualizations(
     plt.close()
     
     # 4. 城市TOP10销售额对比图
-    plt.figure(figsize=(12, 6))
+    fig, ax = plt.subplots(figsize=(12, 6))
     top10_cities = city_analysis.head(10)
-    sns.barplot(data=top10_cities.reset_index(), x='city', y='total_sales')
-    plt.title('销售额TOP10城市')
-    plt.xlabel('城市')
-    plt.ylabel('销售额')
-    plt.xticks(rotation=45)
+    ax.bar(top10_cities.index.to_numpy(), top10_cities['total_sales'].to_numpy())
+    ax.set(title='销售额TOP10城市', xlabel='城市', ylabel='销售额')
+    ax.tick_params(axis='x', labelrotation=45)
     plt.tight_layout()
     plt.savefig(os.path.join(output_dir, 'top10_cities_sales.png'))
     plt.close()
 
-def create_advanced_visualizations(df: pd.DataFrame, output_dir: str):
-    """创建高级可视化图表"""
-    
-    # 确保设置中文字体
-    set_chinese_font()
-    
-    # 1. 产品利润矩阵（气泡图）
-    plt.figure(figsize=(12, 8))
-    product_analysis = df.groupby('product').agg({
-        'total_sales': 'sum',
-        'profit': 'sum',
-        'quantity': 'sum'
-    }).reset_index()
+def _init_plot_worker():
+    """绘图子进程初始化：加快长折线的栅格化"""
+    mpl.rcParams['agg.path.chunksize'] = 10000
+
+def _new_figure(figsize, **kwargs):
+    """创建不依赖pyplot全局状态的Figure，布局在绘制时由constrained layout完成"""
+    fig = Figure(figsize=figsize, layout='constrained', **kwargs)
+    FigureCanvasAgg(fig)
+    return fig
+
+def _plot_product_profit_matrix(product_analysis: pd.DataFrame, output_path: str):
+    """产品利润矩阵（气泡图），product_analysis为按产品汇总的结果"""
+    fig = _new_figure((12, 8))
+    ax = fig.add_subplot()
+    product_analysis = product_analysis.rename_axis('product').reset_index()
     
     # 计算销售额占比和利润率
     total_sales = product_analysis['total_sales'].sum()
     product_analysis['sales_ratio'] = (product_analysis['total_sales'] / total_sales * 100)
     product_analysis['profit_ratio'] = (product_analysis['profit'] / product_analysis['total_sales'] * 100)
     
-    plt.scatter(product_analysis['sales_ratio'], 
-                product_analysis['profit_ratio'],
-                s=product_analysis['quantity']/30,
-                alpha=0.6)
+    ax.scatter(product_analysis['sales_ratio'], 
+               product_analysis['profit_ratio'],
+               s=product_analysis['quantity']/30,
+               alpha=0.6)
     
     # 添加产品标签，优化标签位置
     for i, row in product_analysis.iterrows():
-        plt.annotate(row['product'], 
+        ax.annotate(row['product'], 
                     (row['sales_ratio'], row['profit_ratio']),
                     xytext=(5, 5), 
                     textcoords='offset points',
                     fontsize=10,
                     bbox=dict(facecolor='white', edgecolor='none', alpha=0.7))
     
-    plt.title('产品利润矩阵分析', fontsize=12, pad=15)
-    plt.xlabel('销售额占比(%)', fontsize=10)
-    plt.ylabel('利润率(%)', fontsize=10)
-    plt.grid(True, linestyle='--', alpha=0.6)
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, 'product_profit_matrix.png'), dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 2. 区域渠道热力图
-    plt.figure(figsize=(12, 8))
+    ax.set_title('产品利润矩阵分析', fontsize=12, pad=15)
+    ax.set_xlabel('销售额占比(%)', fontsize=10)
+    ax.set_ylabel('利润率(%)', fontsize=10)
+    ax.grid(True, linestyle='--', alpha=0.6)
+    fig.savefig(output_path, dpi=300)
+
+def _plot_region_channel_heatmap(df: pd.DataFrame, output_path: str):
+    """区域渠道热力图"""
+    fig = _new_figure((12, 8))
+    ax = fig.add_subplot()
     pivot_table = pd.pivot_table(df, 
                                 values='profit',
                                 index='region',
                                 columns='channel',
-                                aggfunc='sum')
-    
-    sns.heatmap(pivot_table, annot=True, fmt='.0f', cmap='YlOrRd', 
-                annot_kws={'size': 10})
-    plt.title('区域渠道利润热力图', fontsize=12, pad=15)
-    plt.xlabel('销售渠道', fontsize=10)
-    plt.ylabel('区域', fontsize=10)
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, 'region_channel_heatmap.png'), dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 3. 城市销售额Top10（横向柱状图）
-    plt.figure(figsize=(12, 6))
-    city_sales = df.groupby(['city', 'region']).agg({
-        'total_sales': 'sum'
-    }).reset_index().sort_values('total_sales', ascending=True)
+                                aggfunc='sum',
+                                observed=True)
+    
+    sns.heatmap(pivot_table.to_numpy(), annot=True, fmt='.0f', cmap='YlOrRd', 
+                annot_kws={'size': 10}, ax=ax,
+                xticklabels=pivot_table.columns, yticklabels=pivot_table.index)
+    ax.set_title('区域渠道利润热力图', fontsize=12, pad=15)
+    ax.set_xlabel('销售渠道', fontsize=10)
+    ax.set_ylabel('区域', fontsize=10)
+    fig.savefig(output_path, dpi=300)
+
+def _plot_city_sales_top10(city_sales: pd.DataFrame, output_path: str):
+    """城市销售额Top10（横向柱状图），city_sales为按城市汇总并附带所属区域的结果"""
+    fig = _new_figure((12, 6))
+    ax = fig.add_subplot()
+    city_sales = city_sales.rename_axis('city').reset_index().sort_values('total_sales', ascending=True)
     
     top10_cities = city_sales.tail(10)
     
     # 使用不同颜色区分不同区域
-    colors = plt.cm.Set3(np.linspace(0, 1, len(df['region'].unique())))
-    color_dict = dict(zip(df['region'].unique(), colors))
+    regions = city_sales['region'].cat.categories
+    colors = mpl.colormaps['Set3'](np.linspace(0, 1, len(regions)))
+    color_dict = dict(zip(regions, colors))
     bar_colors = [color_dict[region] for region in top10_cities['region']]
     
-    bars = plt.barh(top10_cities['city'], top10_cities['total_sales'], 
+    bars = ax.barh(top10_cities['city'], top10_cities['total_sales'], 
                    color=bar_colors)
     
     # 添加数值标签
     for bar in bars:
         width = bar.get_width()
-        plt.text(width, bar.get_y() + bar.get_height()/2, 
+        ax.text(width, bar.get_y() + bar.get_height()/2, 
                 f'¥{width:,.0f}', 
                 ha='left', va='center',
                 fontsize=9)
     
-    plt.title('城市销售额Top10', fontsize=12, pad=15)
-    plt.xlabel('销售额（元）', fontsize=10)
-    plt.ylabel('城市', fontsize=10)
+    ax.set_title('城市销售额Top10', fontsize=12, pad=15)
+    ax.set_xlabel('销售额（元）', fontsize=10)
+    ax.set_ylabel('城市', fontsize=10)
     
     # 添加图例
-    legend_elements = [plt.Rectangle((0,0),1,1, facecolor=color) 
+    legend_elements = [Rectangle((0,0),1,1, facecolor=color) 
                       for color in color_dict.values()]
-    plt.legend(legend_elements, color_dict.keys(), 
+    ax.legend(legend_elements, color_dict.keys(), 
               title='区域', loc='lower right')
     
-    plt.grid(True, linestyle='--', alpha=0.3)
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, 'city_sales_top10_horizontal.png'), 
-                dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 4. 渠道利润率雷达图
-    plt.figure(figsize=(10, 10))
-    channel_metrics = df.groupby('channel').agg({
-        'profit': 'sum',
-        'total_sales': 'sum'
-    })
+    ax.grid(True, linestyle='--', alpha=0.3)
+    fig.savefig(output_path, dpi=300)
+
+def _plot_channel_profit_radar(channel_analysis: pd.DataFrame, output_path: str):
+    """渠道利润率雷达图，channel_analysis为按渠道汇总的结果"""
+    fig = _new_figure((10, 10))
+    # 按渠道名称排列各轴，与汇总结果的排序无关
+    channel_metrics = channel_analysis[['profit', 'total_sales']].sort_index()
     channel_metrics['profit_ratio'] = channel_metrics['profit'] / channel_metrics['total_sales'] * 100
     
     angles = np.linspace(0, 2*np.pi, len(channel_metrics.index), endpoint=False)
@@ -270,7 +279,7 @@ def create_advanced_visualizations(df: pd.DataFrame, output_dir: str):
     values = np.concatenate((values, [values[0]]))
     angles = np.concatenate((angles, [angles[0]]))
     
-    ax = plt.subplot(111, polar=True)
+    ax = fig.add_subplot(111, polar=True)
     ax.plot(angles, values, 'o-', linewidth=2)
     ax.fill(angles, values, alpha=0.25)
     ax.set_xticks(angles[:-1])
@@ -278,20 +287,17 @@ def create_advanced_visualizations(df: pd.DataFrame, output_dir: str):
     
     # 添加网格和标签
     ax.set_ylim(0, max(values) * 1.2)
-    plt.title('各渠道利润率分析', fontsize=12, pad=15)
+    ax.set_title('各渠道利润率分析', fontsize=12, pad=15)
     
     # 添加利润率标签
     for angle, value in zip(angles[:-1], values[:-1]):
-        plt.text(angle, value + 2, f'{value:.1f}%', 
+        ax.text(angle, value + 2, f'{value:.1f}%', 
                 ha='center', va='center')
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, 'channel_profit_radar.png'), 
-                dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 5. 时间趋势分析（双轴图）
-    plt.figure(figsize=(15, 6))
+    fig.savefig(output_path, dpi=300)
+
+def _plot_sales_profit_trend(df: pd.DataFrame, output_path: str):
+    """时间趋势分析（双轴图）"""
     daily_metrics = df.groupby('date').agg({
         'total_sales': 'sum',
         'profit': 'sum',
@@ -299,7 +305,8 @@ def create_advanced_visualizations(df: pd.DataFrame, output_dir: str):
     }).reset_index()
     daily_metrics['profit_ratio'] = daily_metrics['profit'] / daily_metrics['total_sales'] * 100
     
-    fig, ax1 = plt.subplots(figsize=(15, 6))
+    fig = _new_figure((15, 6))
+    ax1 = fig.add_subplot()
     ax2 = ax1.twinx()
     
     bars = ax1.bar(daily_metrics['date'], daily_metrics['total_sales'], 
@@ -316,32 +323,30 @@ def create_advanced_visualizations(df: pd.DataFrame, output_dir: str):
     lines2, labels2 = ax2.get_legend_handles_labels()
     ax1.legend(lines1 + lines2, labels1 + labels2, loc='upper right')
     
-    plt.title('销售额和利润率趋势', fontsize=12, pad=15)
-    plt.grid(True, linestyle='--', alpha=0.3)
+    ax2.set_title('销售额和利润率趋势', fontsize=12, pad=15)
+    ax2.grid(True, linestyle='--', alpha=0.3)
     fig.autofmt_xdate()  # 自动调整x轴日期标签
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, 'sales_profit_trend.png'), 
-                dpi=300, bbox_inches='tight')
-    plt.close()
-    
-    # 6. 产品-成本散点分布
-    plt.figure(figsize=(12, 8))
-    colors = plt.cm.Set3(np.linspace(0, 1, len(df['product'].unique())))
-    color_dict = dict(zip(df['product'].unique(), colors))
-    
-    for product in df['product'].unique():
-        product_data = df[df['product'] == product]
-        plt.scatter(product_data['total_cost'], product_data['profit'], 
-                   alpha=0.6, label=product, 
-                   color=color_dict[product])
-        
-        # 添加产品均值点和标签
-        mean_cost = product_data['total_cost'].mean()
-        mean_profit = product_data['profit'].mean()
-        plt.scatter(mean_cost, mean_profit, 
-                   color=color_dict[product], 
-                   s=100, marker='*')
-        plt.annotate(f'{product}\n平均值', 
+    fig.savefig(output_path, dpi=300)
+
+def _plot_cost_profit_scatter(df: pd.DataFrame, output_path: str):
+    """产品-成本散点分布"""
+    fig = _new_figure((12, 8))
+    ax = fig.add_subplot()
+    product = df['product'].astype('category').cat.remove_unused_categories()
+    products = product.cat.categories
+    colors = mpl.colormaps['Set3'](np.linspace(0, 1, len(products)))
+    
+    # 所有记录一次绘制，按产品编码着色
+    ax.scatter(df['total_cost'], df['profit'], 
+               alpha=0.6, color=colors[product.cat.codes.to_numpy()])
+    
+    # 添加产品均值点和标签
+    product_means = df.groupby(product, observed=True)[['total_cost', 'profit']].mean()
+    ax.scatter(product_means['total_cost'], product_means['profit'], 
+               color=colors, 
+               s=100, marker='*')
+    for name, mean_cost, mean_profit in zip(products, product_means['total_cost'], product_means['profit']):
+        ax.annotate(f'{name}\n平均值', 
                     (mean_cost, mean_profit),
                     xytext=(10, 10),
                     textcoords='offset points',
@@ -350,37 +355,72 @@ def create_advanced_visualizations(df: pd.DataFrame, output_dir: str):
                              alpha=0.7),
                     fontsize=9)
     
-    plt.xlabel('成本（元）', fontsize=10)
-    plt.ylabel('利润（元）', fontsize=10)
-    plt.title('产品成本-利润分布', fontsize=12, pad=15)
-    plt.grid(True, linestyle='--', alpha=0.3)
+    ax.set_xlabel('成本（元）', fontsize=10)
+    ax.set_ylabel('利润（元）', fontsize=10)
+    ax.set_title('产品成本-利润分布', fontsize=12, pad=15)
+    ax.grid(True, linestyle='--', alpha=0.3)
     
     # 调整图例位置和字体
-    legend = plt.legend(title='产品类型', 
+    legend_elements = [Line2D([], [], marker='o', linestyle='', color=color, alpha=0.6) 
+                       for color in colors]
+    legend = ax.legend(legend_elements, products, title='产品类型', 
                        bbox_to_anchor=(1.05, 1), 
                        loc='upper left')
     
-    plt.tight_layout()
-    plt.savefig(os.path.join(output_dir, 'cost_profit_scatter.png'), 
-                dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.savefig(output_path, dpi=300)
+
+def create_advanced_visualizations(
+    df: pd.DataFrame,
+    output_dir: str,
+    *,
+    product_analysis: pd.DataFrame,
+    city_analysis: pd.DataFrame,
+    channel_analysis: pd.DataFrame
+):
+    """创建高级可视化图表，已在analyze_sales_data中汇总的结果直接复用"""
+    
+    # 城市所属区域只需按唯一城市查找一次，区域按在数据中首次出现的顺序排列（决定配色）
+    region_map = df[['city', 'region']].drop_duplicates().set_index('city')['region']
+    city_regions = pd.Categorical(city_analysis.index.map(region_map), categories=list(region_map.unique()))
+    city_sales = city_analysis[['total_sales']].assign(region=city_regions)
+    
+    # 六张图相互独立，每张图只传入它需要的数据，在多个进程中并行绘制和编码PNG
+    plot_tasks = [
+        (_plot_product_profit_matrix, product_analysis[['total_sales', 'profit', 'quantity']], 'product_profit_matrix.png'),
+        (_plot_region_channel_heatmap, df[['region', 'channel', 'profit']], 'region_channel_heatmap.png'),
+        (_plot_city_sales_top10, city_sales, 'city_sales_top10_horizontal.png'),
+        (_plot_channel_profit_radar, channel_analysis, 'channel_profit_radar.png'),
+        (_plot_sales_profit_trend, df[['date', 'total_sales', 'profit', 'total_cost']], 'sales_profit_trend.png'),
+        (_plot_cost_profit_scatter, df[['product', 'total_cost', 'profit']], 'cost_profit_scatter.png'),
+    ]
+    
+    max_workers = min(len(plot_tasks), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_plot_worker) as executor:
+        futures = [
+            executor.submit(plot_func, plot_data, os.path.join(output_dir, filename))
+            for plot_func, plot_data, filename in plot_tasks
+        ]
+        for future in futures:
+            future.result()
 
 def print_analysis_results(analysis_results: Dict[str, pd.DataFrame], output_dir: str):
     """打印分析结果"""
     print("\n=== 月度分析 ===")
-    print(analysis_results['monthly_analysis'])
+    monthly_analysis = analysis_results['monthly_analysis'].round(2)
+    monthly_analysis.index = pd.DatetimeIndex(monthly_analysis.index).strftime('%Y-%m')
+    print(monthly_analysis)
     
     print("\n=== 地区分析 ===")
-    print(analysis_results['region_analysis'])
+    print(analysis_results['region_analysis'].round(2))
     
     print("\n=== 城市分析（TOP 10）===")
-    print(analysis_results['city_analysis'].head(10))
+    print(analysis_results['city_analysis'].head(10).round(2))
     
     print("\n=== 销售渠道分析 ===")
-    print(analysis_results['channel_analysis'])
+    print(analysis_results['channel_analysis'].round(2))
     
     print("\n=== 产品分析 ===")
-    print(analysis_results['product_analysis'])
+    print(analysis_results['product_analysis'].round(2))
     
     print(f"\n可视化图表已保存到目录 {output_dir}：")
     print("1. monthly_sales_trend.png - 月度销售趋势图")
@@ -395,18 +435,27 @@ def print_analysis_results(analysis_results: Dict[str, pd.DataFrame], output_dir
     print("10. cost_profit_scatter.png - 成本-利润分布图")
 
 if __name__ == "__main__":
-    # 从CSV文件读取销售数据
-    # 注意：这里假设数据文件在data目录下，文件名格式为sales_data_*.csv
+    # 从Parquet或CSV文件读取销售数据，优先使用Parquet
+    # 注意：这里假设数据文件在data目录下，文件名格式为sales_data_*.parquet 或 sales_data_*.csv
     data_dir = "data"
-    csv_files = [f for f in os.listdir(data_dir) if f.startswith('sales_data_') and f.endswith('.csv')]
-    
-    if not csv_files:
+    with os.scandir(data_dir) as entries:
+        # 使用最新的数据文件：按文件名中的时间戳比较，同一批数据优先使用Parquet
+        latest_entry = max(
+            (entry for entry in entries
+             if entry.name.startswith('sales_data_') and entry.name.endswith(('.parquet', '.csv'))),
+            key=lambda entry: (os.path.splitext(entry.name)[0], entry.name.endswith('.parquet')),
+            default=None
+        )
+    
+    if latest_entry is None:
         print("错误：未找到销售数据文件！")
-        exit(1)
+        sys.exit(1)
     
-    # 使用最新的数据文件
-    latest_file = sorted(csv_files)[-1]
-    df = pd.read_csv(os.path.join(data_dir, latest_file))
+    if latest_entry.name.endswith('.parquet'):
+        # 只读取分析需要的列
+        df = pd.read_parquet(latest_entry.path, columns=ANALYSIS_COLUMNS)
+    else:
+        df = pd.read_csv(latest_entry.path)
     
     # 进行销售分析
     output_dir = "reports"
@@ -1,19 +1,54 @@
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 from datetime import datetime, timedelta
 import os
 
-def generate_sales_data(num_days=100, records_per_day=(3, 8), output_dir="data"):
+# 检查是否安装了xlsxwriter库（可按行流式写入，写入速度比openpyxl快）
+try:
+    import xlsxwriter
+    HAS_XLSXWRITER = True
+except ImportError:
+    HAS_XLSXWRITER = False
+
+def write_excel_constant_memory(df, output_file):
     """
-    生成随机销售数据并保存为Excel文件
+    使用xlsxwriter的constant_memory模式按行写入Excel，内存中只保留当前行
+    
+    参数:
+    df: 要写入的DataFrame
+    output_file: 输出文件路径
+    """
+    # constant_memory模式要求按行顺序写入，因此不能用to_excel（它按列写单元格）
+    workbook = xlsxwriter.Workbook(output_file, {
+        'constant_memory': True,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss'
+    })
+    try:
+        worksheet = workbook.add_worksheet()
+        worksheet.write_row(0, 0, list(df.columns))
+        rows = zip(*(df[col].tolist() for col in df.columns))
+        for row_idx, row in enumerate(rows, start=1):
+            worksheet.write_row(row_idx, 0, row)
+    finally:
+        workbook.close()
+
+def generate_sales_data(num_days=100, records_per_day=(3, 8), output_dir="data", output_format="parquet"):
+    """
+    生成随机销售数据并保存为Parquet、CSV或Excel文件
     
     参数:
     num_days: 要生成的天数
     records_per_day: 每天生成的记录数范围，元组格式(最小值, 最大值)
     output_dir: 输出目录
+    output_format: 输出格式，'parquet'（默认，列式二进制，读写更快）、'csv' 或 'excel'（逐单元格写入，数据量大时很慢）
     """
-    # 设置随机种子确保可重复性
-    np.random.seed(42)
+    if output_format not in ('parquet', 'csv', 'excel'):
+        raise ValueError(f"不支持的输出格式: {output_format}")
+    
+    # 使用固定种子的随机数生成器确保可重复性
+    rng = np.random.default_rng(42)
     
     # 生成日期序列：从当前日期往前推num_days天
     end_date = datetime(2025, 4, 20)  # 当前日期
@@ -63,58 +98,79 @@ def generate_sales_data(num_days=100, records_per_day=(3, 8), output_dir="data")
     # 新增销售渠道
     channels = ['直营店',"加盟店"]
     
-    # 创建空列表存储所有记录
-    all_records = []
-    
-    # 为每一天生成多条记录
-    for day in range(num_days):
-        current_date = start_date + timedelta(days=day)
-        # 随机决定这一天生成多少条记录
-        daily_records = np.random.randint(records_per_day[0], records_per_day[1] + 1)
-        
-        for _ in range(daily_records):
-            # 随机选择产品和其他属性
-            product = np.random.choice(products)
-            category = product_category_map[product]  # 根据产品确定品类
-            region = np.random.choice(regions)
-            city = np.random.choice(cities[region])
-            channel = np.random.choice(channels)
-            quantity = np.random.randint(1, 5)
-            unit_price = np.random.uniform(15, 88)  # 火锅菜品价格一般在15-88元之间
-            unit_price = round(unit_price, 2)
-            unit_cost = round(unit_price * np.random.uniform(0.3, 0.6), 2)  # 火锅店的成本比例通常在30-60%
-            total_sales = round(quantity * unit_price, 2)
-            total_cost = round(quantity * unit_cost, 2)
-            profit = round(total_sales - total_cost, 2)
-            
-            # 添加记录
-            all_records.append({
-                'date': current_date,
-                'product': product,
-                'category': category,
-                'region': region,
-                'city': city,
-                'channel': channel,
-                'quantity': quantity,
-                'unit_price': unit_price,
-                'unit_cost': unit_cost,
-                'total_sales': total_sales,
-                'total_cost': total_cost,
-                'profit': profit
-            })
-    
-    # 将所有记录转换为DataFrame
-    df = pd.DataFrame(all_records)
+    # 随机决定每一天生成多少条记录，并据此一次性生成所有列
+    daily_counts = rng.integers(records_per_day[0], records_per_day[1] + 1, size=num_days)
+    num_records = int(daily_counts.sum())
+    
+    # 每个日期按当天的记录数重复
+    day_offsets = np.arange(num_days) * np.timedelta64(1, 'D')
+    dates = np.repeat((np.datetime64(start_date, 'D') + day_offsets).astype('datetime64[ns]'), daily_counts)
+    
+    # 随机选择产品和其他属性：先抽产品下标，再用下标取产品和对应品类
+    # 与products一一对齐的品类编码，按下标直接取值代替逐行查字典
+    categories_by_product = np.array([categories.index(product_category_map[p]) for p in products])
+    prod_idx = rng.integers(0, len(products), size=num_records)
+    # 产品和品类都以固定类别的Categorical保存，只存整数编码
+    product = pd.Categorical.from_codes(prod_idx, categories=products)
+    category = pd.Categorical.from_codes(categories_by_product[prod_idx], categories=categories)  # 根据产品确定品类
+    
+    # 城市按 (地区, 城市) 排成二维表，先抽地区再在该地区内抽城市
+    city_table = np.array([cities[r] for r in regions])
+    region_idx = rng.integers(0, len(regions), size=num_records)
+    city_idx = rng.integers(0, city_table.shape[1], size=num_records)
+    # 地区、城市和渠道同样以固定类别的Categorical保存，城市编码即其在二维表展平后的位置
+    region = pd.Categorical.from_codes(region_idx, categories=regions)
+    city = pd.Categorical.from_codes(region_idx * city_table.shape[1] + city_idx, categories=city_table.ravel())
+    
+    channel = pd.Categorical.from_codes(rng.integers(0, len(channels), size=num_records), categories=channels)
+    quantity = rng.integers(1, 5, size=num_records)
+    # 金额列先算出乘积/差值，再用out=原地保留两位小数，不再为每步取整分配临时数组
+    unit_price = rng.uniform(15, 88, size=num_records)  # 火锅菜品价格一般在15-88元之间
+    np.round(unit_price, 2, out=unit_price)
+    unit_cost = rng.uniform(0.3, 0.6, size=num_records)  # 火锅店的成本比例通常在30-60%
+    np.multiply(unit_cost, unit_price, out=unit_cost)
+    np.round(unit_cost, 2, out=unit_cost)
+    total_sales = np.multiply(quantity, unit_price)
+    np.round(total_sales, 2, out=total_sales)
+    total_cost = np.multiply(quantity, unit_cost)
+    np.round(total_cost, 2, out=total_cost)
+    profit = np.subtract(total_sales, total_cost)
+    np.round(profit, 2, out=profit)
+    
+    # 由各列数组直接构建DataFrame
+    df = pd.DataFrame({
+        'date': dates,
+        'product': product,
+        'category': category,
+        'region': region,
+        'city': city,
+        'channel': channel,
+        'quantity': quantity,
+        'unit_price': unit_price,
+        'unit_cost': unit_cost,
+        'total_sales': total_sales,
+        'total_cost': total_cost,
+        'profit': profit
+    })
     
     # 确保输出目录存在
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
     
     # 生成输出文件路径
-    output_file = os.path.join(output_dir, f'sales_data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx')
+    file_extension = 'xlsx' if output_format == 'excel' else output_format
+    output_file = os.path.join(output_dir, f'sales_data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{file_extension}')
     
     # 保存数据
-    df.to_excel(output_file, index=False)
+    if output_format == 'parquet':
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        pq.write_table(table, output_file, compression='zstd', use_dictionary=True)
+    elif output_format == 'csv':
+        df.to_csv(output_file, index=False)
+    elif HAS_XLSXWRITER:
+        write_excel_constant_memory(df, output_file)
+    else:
+        df.to_excel(output_file, index=False)
     
     return df, output_file
 
@@ -123,11 +179,13 @@ def print_data_summary(df):
     print("\n=== 数据预览 ===")
     print(df.head())
     
+    # 只计算需要的统计量，避免describe()对每列求分位数
     print("\n=== 基本统计信息 ===")
-    print(df.describe())
+    numeric_columns = ['quantity', 'unit_price', 'unit_cost', 'total_sales', 'total_cost', 'profit']
+    print(df[numeric_columns].agg(['min', 'mean', 'max']))
     
     print("\n=== 每日销售记录数量统计 ===")
-    print(df.groupby('date').size().describe())
+    print(df.groupby('date', observed=True).size().agg(['min', 'median', 'max']))
 
 if __name__ == "__main__":
     # 生成销售数据，设置100天的数据，每天3-8条记录
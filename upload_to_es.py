@@ -19,7 +19,7 @@
     python upload_to_es.py --host <ES主机地址> --username <用户名> --password <密码> [选项]
 
 参数说明:
-    --data, -d       要上传的Excel文件路径 (默认: data/processed_data.xlsx)
+    --data, -d       要上传的Excel或Parquet文件路径 (默认: data/processed_data.xlsx)
     --host           华为云ElasticSearch主机地址 (必填)
     --port           ElasticSearch端口 (默认: 9200)
     --username       ElasticSearch用户名 (必填)
@@ -27,6 +27,10 @@
     --index          索引名称 (默认: products)
     --no-ssl         不使用SSL连接 (默认使用SSL)
     --chunk-size     批量上传的大小 (默认: 1000)
+    --threads        并行上传的线程数 (默认: CPU核数与8中的较小值)
+    --max-chunk-bytes 单个批量请求的最大字节数，实际批量大小会据此自动调整 (默认: 10485760)
+    --fast-load      上传期间关闭索引刷新和副本，完成后恢复原设置 (默认关闭)
+    --mode           写入模式: index 覆盖写入, create 只写入新文档, upsert-if-changed 只写入内容有变化的文档 (默认: index)
 
 示例:
     python upload_to_es.py --host es-cn-north-4.myhuaweicloud.com --username admin --password pass123 --index jewelry_products
@@ -36,9 +40,18 @@
     产品名称: 使用IK分词器的text类型，支持中文全文搜索
     品目:    使用IK分词器的text类型，支持中文全文搜索
     上传时间: 自动添加的时间戳记录
+    内容哈希: upsert-if-changed模式下写入的内容摘要，仅存储不索引
+
+文档ID:
+    由 uuid5("款号-产品名称") 生成。空值统一记为"nan"，整数值的浮点数（如1001.0）统一记为"1001"，
+    因此Excel和Parquet输入得到相同的ID。
+    注意：旧版本对含空单元格的数字款号列使用"1001.0"生成ID，这类文档重新上传时ID会变化，
+    需要先删除旧文档或重建索引，否则会产生重复文档。
 
 注意事项:
     - 请确保已安装所需的依赖包：pip install -r requirements.txt
+    - 可选安装polars和fastexcel（pip install polars fastexcel）以加快Excel/Parquet的读取
+    - 可选安装orjson（pip install orjson）以加快批量请求的JSON编码
     - 运行前请确认华为云ElasticSearch服务已开通并可正常访问
     - 中文搜索功能依赖于华为云ES服务中已安装的IK分词器
     - 生产环境中应配置适当的证书验证
@@ -48,12 +61,36 @@ import os
 import sys
 import argparse
 import pandas as pd
+import pyarrow.parquet as pq
+from openpyxl import load_workbook
 from elasticsearch import Elasticsearch, helpers
-from elasticsearch.exceptions import ConnectionError, NotFoundError
+from elasticsearch.exceptions import ConnectionError, NotFoundError, SerializationError
+from elasticsearch.serializer import JSONSerializer
 import uuid
+import hashlib
+import json
 import logging
+from itertools import chain, islice
+from multiprocessing import Pool
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
 
+# Polars为可选依赖，安装后使用其多线程列式读取器（Excel使用calamine引擎）
+try:
+    import polars as pl
+    HAS_POLARS = True
+except ImportError:
+    HAS_POLARS = False
+
+# orjson为可选依赖，安装后用于批量请求体的JSON编解码
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
 # 配置日志
 logging.basicConfig(
     level=logging.INFO,
@@ -65,7 +102,57 @@ logging.basicConfig(
 )
 logger = logging.getLogger("elasticsearch_uploader")
 
-def connect_to_huaweicloud_es(es_host, es_port, es_username, es_password, use_ssl=True):
+# 上传所需的列
+REQUIRED_COLUMNS = ['款号', '产品名称', '品目']
+
+# 并行上传的默认线程数、待发送批次队列长度和单个批次的默认最大字节数
+DEFAULT_THREAD_COUNT = min(8, os.cpu_count() or 1)
+BULK_QUEUE_SIZE = 4
+DEFAULT_MAX_CHUNK_BYTES = 10 * 1024 * 1024
+
+# 批量请求被拒绝（429）时的重试次数和退避时间（秒）
+BULK_MAX_RETRIES = 3
+BULK_INITIAL_BACKOFF = 2
+BULK_MAX_BACKOFF = 60
+
+# 估算平均文档大小时抽样的操作数
+CHUNK_SIZE_SAMPLE = 100
+
+# 写入模式，以及upsert-if-changed模式下的内容哈希字段和每次mget查询的文档数
+BULK_MODES = ('index', 'create', 'upsert-if-changed')
+CONTENT_HASH_FIELD = "内容哈希"
+MGET_BATCH_SIZE = 1000
+
+# 文档数达到该值时才用多进程计算文档ID，数据量小时进程启动和数据传输的开销得不偿失
+PARALLEL_DOC_ID_THRESHOLD = 100000
+
+# 已写入命名空间的SHA1状态，每个文档ID只需复制后追加键值即可，结果与uuid.uuid5一致
+_DOC_ID_HASHER = hashlib.sha1(uuid.NAMESPACE_DNS.bytes)
+
+class OrjsonSerializer(JSONSerializer):
+    """
+    基于orjson的序列化器，编码结果与JSONSerializer一致（紧凑格式、不转义中文），
+    可直接序列化numpy类型，其余类型交给JSONSerializer.default处理
+    """
+    
+    def dumps(self, data):
+        # 字符串视为已序列化的内容
+        if isinstance(data, str):
+            return data
+        
+        try:
+            return orjson.dumps(data, default=self.default, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+        except (orjson.JSONEncodeError, TypeError) as e:
+            raise SerializationError(data, e)
+    
+    def loads(self, s):
+        try:
+            return orjson.loads(s)
+        except orjson.JSONDecodeError as e:
+            raise SerializationError(s, e)
+
+def connect_to_huaweicloud_es(es_host, es_port, es_username, es_password, use_ssl=True,
+                              pool_size=DEFAULT_THREAD_COUNT):
     """
     连接到华为云ElasticSearch服务
     
@@ -75,6 +162,7 @@ def connect_to_huaweicloud_es(es_host, es_port, es_username, es_password, use_ss
         es_username (str): 用户名
         es_password (str): 密码
         use_ssl (bool): 是否使用SSL连接
+        pool_size (int): 每个节点的HTTP连接池大小，应不小于并行上传的线程数
         
     Returns:
         Elasticsearch: ElasticSearch客户端对象
@@ -84,13 +172,21 @@ def connect_to_huaweicloud_es(es_host, es_port, es_username, es_password, use_ss
         es_url = f"{'https' if use_ssl else 'http'}://{es_host}:{es_port}"
         logger.info(f"正在连接到华为云ElasticSearch服务: {es_url}")
         
-        # 创建ES客户端
+        # 创建ES客户端，安装了orjson时使用更快的序列化器
+        client_options = {"serializer": OrjsonSerializer()} if HAS_ORJSON else {}
         es_client = Elasticsearch(
             [es_url],
             http_auth=(es_username, es_password),
             use_ssl=use_ssl,
             verify_certs=False,  # 在生产环境中应设置为True并提供正确的证书
-            ssl_show_warn=False
+            ssl_show_warn=False,
+            # 连接池大小与上传线程数一致，各线程复用已建立的TLS连接；批量请求体启用gzip压缩
+            maxsize=pool_size,
+            http_compress=True,
+            sniff_on_start=False,
+            timeout=60,
+            retry_on_timeout=True,
+            **client_options
         )
         
         # 验证连接
@@ -147,7 +243,8 @@ def create_index_if_not_exists(es_client, index_name, mapping=None):
                                     "keyword": {"type": "keyword", "ignore_above": 256}
                                 }
                             },
-                            "上传时间": {"type": "date", "format": "yyyy-MM-dd HH:mm:ss||yyyy-MM-dd||epoch_millis"}
+                            "上传时间": {"type": "date", "format": "yyyy-MM-dd HH:mm:ss||yyyy-MM-dd||epoch_millis"},
+                            CONTENT_HASH_FIELD: {"type": "keyword", "index": False}
                         }
                     },
                     "settings": {
@@ -171,7 +268,7 @@ def generate_actions(df, index_name):
     生成批量上传操作
     
     Args:
-        df (DataFrame): 包含数据的DataFrame
+        df (DataFrame): 包含数据的DataFrame（pandas或Polars）
         index_name (str): 索引名称
         
     Returns:
@@ -179,91 +276,462 @@ def generate_actions(df, index_name):
     """
     current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     
-    for _, row in df.iterrows():
-        # 创建文档
-        doc = {
-            "款号": row["款号"],
-            "产品名称": row["产品名称"],
-            "品目": row["品目"],
-            "上传时间": current_time
+    # 直接按列取出Python对象列表再zip遍历，避免iterrows为每行构造Series
+    style_nos, product_names, categories = (df[col].to_list() for col in REQUIRED_COLUMNS)
+    # 先整批计算文档ID
+    doc_ids = compute_doc_ids(style_nos, product_names)
+    # 操作和文档直接用字典字面量构建，不经过额外的函数调用
+    for doc_id, style_no, product_name, category in zip(doc_ids, style_nos, product_names, categories):
+        yield {
+            "_index": index_name,
+            "_id": doc_id,
+            "_source": {"款号": style_no, "产品名称": product_name, "品目": category, "上传时间": current_time}
         }
+
+def generate_actions_from_rows(rows, column_positions, index_name):
+    """
+    由openpyxl逐行读取的单元格值生成批量上传操作，文档中的单元格值统一转为字符串
+    
+    Args:
+        rows (iterable): 数据行迭代器，每行为单元格值组成的元组
+        column_positions (dict): 列名到行内下标的映射
+        index_name (str): 索引名称
         
-        # 生成文档ID（可以使用款号和产品名称的组合作为唯一标识）
-        doc_id = str(uuid.uuid5(uuid.NAMESPACE_DNS, f"{row['款号']}-{row['产品名称']}"))
-        
-        # 生成操作
+    Returns:
+        generator: 批量上传操作
+    """
+    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    style_pos, name_pos, category_pos = (column_positions[col] for col in REQUIRED_COLUMNS)
+    
+    for values in rows:
+        style_no, product_name, category = values[style_pos], values[name_pos], values[category_pos]
+        # 跳过空行（只读模式下工作表末尾可能带有空行）
+        if style_no is None and product_name is None and category is None:
+            continue
+        # 文档ID由原始单元格值生成，与DataFrame读取路径得到的ID一致
+        doc_id = make_doc_id(style_no, product_name)
+        # 文档内容统一为字符串，空单元格保留为None
+        style_no = None if style_no is None else str(style_no)
+        product_name = None if product_name is None else str(product_name)
+        category = None if category is None else str(category)
         yield {
             "_index": index_name,
             "_id": doc_id,
-            "_source": doc
+            "_source": {"款号": style_no, "产品名称": product_name, "品目": category, "上传时间": current_time}
+        }
+
+def _doc_id_key_part(value):
+    """
+    将参与生成文档ID的单元格值规范为字符串，保证不同读取方式得到相同的ID：
+    空值（None/NaN/pd.NA）统一为"nan"，整数值的浮点数（如含空单元格的数字列中的1001.0）统一为"1001"
+    """
+    if value is None or value is pd.NA:
+        return "nan"
+    if isinstance(value, float):
+        if value != value:
+            return "nan"
+        if value.is_integer():
+            return str(int(value))
+    return str(value)
+
+def make_doc_id(style_no, product_name):
+    """
+    由款号和产品名称生成文档ID，结果等同于 uuid.uuid5(uuid.NAMESPACE_DNS, "款号-产品名称")，
+    其中两部分先经过_doc_id_key_part规范化
+    
+    Args:
+        style_no: 款号
+        product_name: 产品名称
+        
+    Returns:
+        str: 文档ID
+    """
+    hasher = _DOC_ID_HASHER.copy()
+    # 两段拼接时f-string比'-'.join更快
+    hasher.update(f"{_doc_id_key_part(style_no)}-{_doc_id_key_part(product_name)}".encode('utf-8'))
+    # 取SHA1前16字节，按UUID第5版设置版本号和变体位
+    digest = bytearray(hasher.digest()[:16])
+    digest[6] = (digest[6] & 0x0F) | 0x50
+    digest[8] = (digest[8] & 0x3F) | 0x80
+    hex_id = digest.hex()
+    return f"{hex_id[:8]}-{hex_id[8:12]}-{hex_id[12:16]}-{hex_id[16:20]}-{hex_id[20:]}"
+
+def _doc_ids_for_chunk(chunk):
+    """计算一个分块的文档ID（在子进程中执行）"""
+    style_nos, product_names = chunk
+    return list(map(make_doc_id, style_nos, product_names))
+
+def compute_doc_ids(style_nos, product_names, processes=None):
+    """
+    批量生成文档ID，数据量大时按CPU核数分块并用多进程计算
+    
+    Args:
+        style_nos (list): 款号列表
+        product_names (list): 与款号一一对应的产品名称列表
+        processes (int): 进程数，默认为CPU核数
+        
+    Returns:
+        list: 文档ID列表，顺序与输入一致
+    """
+    processes = processes or os.cpu_count() or 1
+    if processes == 1 or len(style_nos) < PARALLEL_DOC_ID_THRESHOLD:
+        return _doc_ids_for_chunk((style_nos, product_names))
+    
+    step = -(-len(style_nos) // processes)
+    chunks = [(style_nos[i:i + step], product_names[i:i + step]) for i in range(0, len(style_nos), step)]
+    doc_ids = []
+    with Pool(processes) as pool:
+        # 使用有序的imap，保证文档ID与各列按行对齐
+        for chunk_ids in pool.imap(_doc_ids_for_chunk, chunks):
+            doc_ids.extend(chunk_ids)
+    return doc_ids
+
+def as_create_actions(actions):
+    """
+    将操作类型改为create，已存在的文档会返回409冲突而不会被重新写入
+    
+    Args:
+        actions (iterator): 批量上传操作迭代器
+        
+    Returns:
+        generator: 批量上传操作
+    """
+    for action in actions:
+        action["_op_type"] = "create"
+        yield action
+
+def content_hash(source):
+    """
+    计算文档内容（不含上传时间）的摘要
+    
+    Args:
+        source (dict): 文档内容
+        
+    Returns:
+        str: 内容摘要
+    """
+    content = "\x1f".join(str(source[col]) for col in REQUIRED_COLUMNS)
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+def ensure_content_hash_mapping(es_client, index_name):
+    """
+    为已有索引补充内容哈希字段的映射，避免被动态映射为分词的text字段
+    
+    Args:
+        es_client (Elasticsearch): ElasticSearch客户端
+        index_name (str): 索引名称
+    """
+    es_client.indices.put_mapping(index=index_name, body={
+        "properties": {CONTENT_HASH_FIELD: {"type": "keyword", "index": False}}
+    })
+
+def skip_unchanged_actions(es_client, index_name, actions, stats, batch_size=MGET_BATCH_SIZE):
+    """
+    按批用mget查询已有文档的内容哈希，只保留新文档和内容有变化的文档
+    
+    Args:
+        es_client (Elasticsearch): ElasticSearch客户端
+        index_name (str): 索引名称
+        actions (iterator): 批量上传操作迭代器
+        stats (dict): 统计信息，跳过的文档数累加到 stats["skipped"]
+        batch_size (int): 每次mget查询的文档数
+        
+    Returns:
+        generator: 需要写入的批量上传操作
+    """
+    skipped = 0
+    while True:
+        batch = list(islice(actions, batch_size))
+        if not batch:
+            break
+        
+        response = es_client.mget(
+            index=index_name,
+            body={"ids": [action["_id"] for action in batch]},
+            _source_includes=[CONTENT_HASH_FIELD]
+        )
+        existing = {
+            doc["_id"]: doc["_source"].get(CONTENT_HASH_FIELD)
+            for doc in response["docs"] if doc.get("found")
         }
+        
+        for action in batch:
+            digest = content_hash(action["_source"])
+            if existing.get(action["_id"]) == digest:
+                skipped += 1
+                stats["skipped"] += 1
+                continue
+            action["_source"][CONTENT_HASH_FIELD] = digest
+            yield action
+    
+    logger.info(f"跳过内容未变化的文档: {skipped} 条")
 
-def upload_data_to_es(es_client, data_file, index_name, chunk_size=1000):
+@contextmanager
+def fast_load_settings(es_client, index_name):
     """
-    将Excel数据上传到ElasticSearch
+    批量导入期间关闭索引刷新并将副本数设为0，退出时恢复原来的设置
     
     Args:
         es_client (Elasticsearch): ElasticSearch客户端
+        index_name (str): 索引名称
+    """
+    settings = es_client.indices.get_settings(index=index_name)
+    index_settings = settings[index_name]["settings"]["index"]
+    # 未显式设置refresh_interval时恢复为None，即重置为集群默认值
+    original = {
+        "refresh_interval": index_settings.get("refresh_interval"),
+        "number_of_replicas": index_settings.get("number_of_replicas")
+    }
+    
+    logger.info(f"快速导入模式: 暂时关闭索引 {index_name} 的刷新和副本")
+    es_client.indices.put_settings(index=index_name, body={
+        "index": {"refresh_interval": "-1", "number_of_replicas": 0}
+    })
+    try:
+        yield
+    finally:
+        es_client.indices.put_settings(index=index_name, body={"index": original})
+        logger.info(f"已恢复索引 {index_name} 的设置: {original}")
+
+def fit_chunk_size(actions, chunk_size, max_chunk_bytes, sample_size=CHUNK_SIZE_SAMPLE):
+    """
+    抽样前若干条操作估算平均文档大小，使每个批次的文档数不超过 max_chunk_bytes / 平均大小
+    
+    Args:
+        actions (iterator): 批量上传操作迭代器
+        chunk_size (int): 批量上传大小的上限
+        max_chunk_bytes (int): 单个批量请求的最大字节数
+        sample_size (int): 抽样的操作数
+        
+    Returns:
+        tuple: (包含抽样部分的完整操作迭代器, 调整后的批量上传大小)
+    """
+    sample = list(islice(actions, sample_size))
+    actions = chain(sample, actions)
+    if not sample:
+        return actions, chunk_size
+    
+    total_bytes = sum(len(json.dumps(action, ensure_ascii=False, default=str).encode('utf-8')) for action in sample)
+    avg_doc_bytes = max(1, total_bytes // len(sample))
+    effective_chunk_size = max(1, min(chunk_size, max_chunk_bytes // avg_doc_bytes))
+    logger.info(f"平均文档大小约 {avg_doc_bytes} 字节，批量上传大小: {effective_chunk_size}")
+    return actions, effective_chunk_size
+
+def read_excel_with_polars(data_file):
+    """
+    使用Polars的calamine引擎读取Excel文件
+    
+    Args:
         data_file (str): Excel文件路径
+        
+    Returns:
+        DataFrame: Polars DataFrame，缺少calamine引擎依赖时返回None
+    """
+    try:
+        # 只读取所需的三列；保留数字类型，文档ID由make_doc_id统一规范化
+        return pl.read_excel(data_file, engine="calamine", columns=REQUIRED_COLUMNS)
+    except ImportError as e:
+        logger.warning(f"Polars缺少calamine引擎依赖，改用openpyxl流式读取: {str(e)}")
+        return None
+
+def open_excel_stream(data_file):
+    """
+    以只读模式打开Excel文件，只读取表头，数据行之后按需逐行读取
+    
+    Args:
+        data_file (str): Excel文件路径
+        
+    Returns:
+        tuple: (工作簿对象, 工作表对象, 列名列表, 数据行数估计)
+    """
+    workbook = load_workbook(data_file, read_only=True, data_only=True)
+    worksheet = workbook.worksheets[0]
+    header = next(worksheet.iter_rows(max_row=1, values_only=True), ())
+    columns = ["" if value is None else str(value) for value in header]
+    # 只读模式下max_row来自工作表的尺寸记录，可能缺失
+    total_rows = worksheet.max_row - 1 if worksheet.max_row else None
+    return workbook, worksheet, columns, total_rows
+
+def iter_required_rows(worksheet, columns):
+    """
+    逐行读取数据区域，只取所需列所在的列范围
+    
+    Args:
+        worksheet: openpyxl只读工作表
+        columns (list): 表头列名列表
+        
+    Returns:
+        tuple: (数据行迭代器, 所需列在行内的下标映射)
+    """
+    positions = {col: columns.index(col) for col in REQUIRED_COLUMNS}
+    first_col, last_col = min(positions.values()), max(positions.values())
+    rows = worksheet.iter_rows(min_row=2, min_col=first_col + 1, max_col=last_col + 1, values_only=True)
+    return rows, {col: pos - first_col for col, pos in positions.items()}
+
+def parallel_streaming_bulk(es_client, actions, thread_count, chunk_size, max_chunk_bytes,
+                            queue_size=BULK_QUEUE_SIZE, raise_on_error=True):
+    """
+    多线程并发执行批量上传，每个线程对一个分块调用streaming_bulk，
+    从而保留429拒绝时的退避重试（helpers.parallel_bulk不支持重试）
+    
+    Args:
+        es_client (Elasticsearch): ElasticSearch客户端
+        actions (iterator): 批量上传操作迭代器
+        thread_count (int): 并行上传的线程数
+        chunk_size (int): 每个分块的操作数
+        max_chunk_bytes (int): 单个批量请求的最大字节数
+        queue_size (int): 除正在发送的分块外，最多预先准备的分块数
+        raise_on_error (bool): 文档写入失败时是否抛出异常
+        
+    Returns:
+        generator: 每条操作的 (是否成功, 结果) 元组
+    """
+    def send_chunk(chunk):
+        # streaming_bulk只有在raise_on_error=False时才会重试单条文档的429，
+        # 因此在重试结束后再按raise_on_error决定是否抛出
+        results = list(helpers.streaming_bulk(
+            es_client,
+            chunk,
+            chunk_size=chunk_size,
+            max_chunk_bytes=max_chunk_bytes,
+            raise_on_error=False,
+            max_retries=BULK_MAX_RETRIES,
+            initial_backoff=BULK_INITIAL_BACKOFF,
+            max_backoff=BULK_MAX_BACKOFF
+        ))
+        if raise_on_error:
+            errors = [result for ok, result in results if not ok]
+            if errors:
+                raise helpers.BulkIndexError(f"{len(errors)} document(s) failed to index.", errors)
+        return results
+    
+    # 操作迭代器只在当前线程中消费，待完成的分块数有上限，避免把全部数据读入内存
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=thread_count) as executor:
+        while True:
+            chunk = list(islice(actions, chunk_size))
+            if not chunk:
+                break
+            pending.append(executor.submit(send_chunk, chunk))
+            if len(pending) >= thread_count + queue_size:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def upload_data_to_es(es_client, data_file, index_name, chunk_size=1000, thread_count=DEFAULT_THREAD_COUNT,
+                      max_chunk_bytes=DEFAULT_MAX_CHUNK_BYTES, fast_load=False, mode='index'):
+    """
+    将Excel或Parquet数据上传到ElasticSearch
+    
+    Args:
+        es_client (Elasticsearch): ElasticSearch客户端
+        data_file (str): Excel或Parquet文件路径
         index_name (str): 索引名称
-        chunk_size (int): 批量上传的大小
+        chunk_size (int): 批量上传大小的上限
+        thread_count (int): 并行上传的线程数
+        max_chunk_bytes (int): 单个批量请求的最大字节数
+        fast_load (bool): 上传期间是否关闭索引刷新和副本
+        mode (str): 写入模式，index、create 或 upsert-if-changed
         
     Returns:
         bool: 上传是否成功
     """
+    workbook = None
     try:
         # 检查文件是否存在
         if not os.path.exists(data_file):
-            logger.error(f"错误: 找不到Excel文件: {data_file}")
+            logger.error(f"错误: 找不到数据文件: {data_file}")
             return False
         
-        # 读取Excel文件
-        logger.info(f"正在读取Excel文件: {data_file}")
-        df = pd.read_excel(data_file)
+        is_parquet = data_file.lower().endswith('.parquet')
         
-        # 显示数据信息
-        logger.info(f"Excel数据尺寸: {df.shape[0]}行 x {df.shape[1]}列")
-        logger.info(f"Excel列名: {', '.join(df.columns)}")
+        # 先只读取表头（Parquet的schema或Excel的第一行）检查必要的列，缺列时不再解析数据部分
+        if is_parquet:
+            columns = pq.read_schema(data_file).names
+        else:
+            workbook, worksheet, columns, total_rows = open_excel_stream(data_file)
+        logger.info(f"列名: {', '.join(columns)}")
         
-        # 检查必要的列是否存在
-        required_columns = ['款号', '产品名称', '品目']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            logger.error(f"错误: Excel文件中缺少以下列: {', '.join(missing_columns)}")
+        missing = set(REQUIRED_COLUMNS) - set(columns)
+        if missing:
+            missing_columns = [col for col in REQUIRED_COLUMNS if col in missing]
+            logger.error(f"错误: 数据文件中缺少以下列: {', '.join(missing_columns)}")
             return False
         
+        df = None
+        if is_parquet:
+            # Parquet为列式存储，直接整体读取
+            logger.info(f"正在读取Parquet文件: {data_file}")
+            if HAS_POLARS:
+                df = pl.read_parquet(data_file, columns=REQUIRED_COLUMNS)
+            else:
+                df = pd.read_parquet(data_file, engine='pyarrow', columns=REQUIRED_COLUMNS)
+        elif HAS_POLARS:
+            # Polars整体读取，不再需要openpyxl打开的工作簿
+            workbook.close()
+            workbook = None
+            logger.info(f"正在使用Polars读取Excel文件: {data_file}")
+            df = read_excel_with_polars(data_file)
+            if df is None:
+                workbook, worksheet, columns, total_rows = open_excel_stream(data_file)
+        
+        if df is not None:
+            logger.info(f"数据尺寸: {df.shape[0]}行 x {df.shape[1]}列")
+        else:
+            # Excel以只读模式逐行读取，边读边上传，不把整张表载入内存
+            logger.info(f"正在以流式方式读取Excel文件: {data_file}")
+            logger.info(f"Excel数据尺寸: 约{total_rows if total_rows is not None else '未知'}行 x {len(columns)}列")
+        
         # 创建索引（如果不存在）
         if not create_index_if_not_exists(es_client, index_name):
             return False
         
         # 批量上传数据
         logger.info(f"开始批量上传数据到索引 {index_name}...")
-        success, failed = 0, 0
+        success, failed, skipped = 0, 0, 0
+        # upsert-if-changed模式下在发送前就被跳过的文档数
+        unchanged = {"skipped": 0}
         
-        # 使用helpers.bulk进行批量操作
-        actions = generate_actions(df, index_name)
-        for ok, result in helpers.streaming_bulk(
-            es_client,
-            actions,
-            chunk_size=chunk_size,
-            max_retries=3,
-            initial_backoff=2,
-            max_backoff=60
-        ):
-            if ok:
-                success += 1
-            else:
-                failed += 1
-                logger.warning(f"上传文档失败: {result}")
-            
-            # 定期报告进度
-            if (success + failed) % 1000 == 0:
-                logger.info(f"已处理 {success + failed} 条记录 (成功: {success}, 失败: {failed})")
-        
-        # 刷新索引，使数据立即可见
-        es_client.indices.refresh(index=index_name)
+        # 多线程并发发送批量请求，每个分块内部带有429退避重试
+        if df is not None:
+            actions = generate_actions(df, index_name)
+        else:
+            rows, column_positions = iter_required_rows(worksheet, columns)
+            actions = generate_actions_from_rows(rows, column_positions, index_name)
+        if mode == 'create':
+            actions = as_create_actions(actions)
+        elif mode == 'upsert-if-changed':
+            ensure_content_hash_mapping(es_client, index_name)
+            actions = skip_unchanged_actions(es_client, index_name, actions, unchanged)
+        actions, chunk_size = fit_chunk_size(actions, chunk_size, max_chunk_bytes)
+        try:
+            with fast_load_settings(es_client, index_name) if fast_load else nullcontext():
+                for ok, result in parallel_streaming_bulk(
+                    es_client,
+                    actions,
+                    thread_count=thread_count,
+                    chunk_size=chunk_size,
+                    max_chunk_bytes=max_chunk_bytes,
+                    # create模式下已存在的文档返回409，需要逐条计为跳过而不是抛出异常
+                    raise_on_error=(mode != 'create')
+                ):
+                    if ok:
+                        success += 1
+                    elif result.get("create", {}).get("status") == 409:
+                        skipped += 1
+                    else:
+                        failed += 1
+                        logger.warning(f"上传文档失败: {result}")
+                    
+                    # 定期报告进度
+                    if (success + failed + skipped) % 1000 == 0:
+                        logger.info(f"已处理 {success + failed + skipped} 条记录 (成功: {success}, 失败: {failed}, 跳过: {skipped})")
+        finally:
+            # 刷新索引，使数据立即可见
+            es_client.indices.refresh(index=index_name)
         
-        logger.info(f"数据上传完成。总记录数: {df.shape[0]}, 成功: {success}, 失败: {failed}")
+        skipped += unchanged["skipped"]
+        logger.info(f"数据上传完成。总记录数: {success + failed + skipped}, 成功: {success}, 失败: {failed}, 跳过: {skipped}")
         
         # 获取索引文档计数
         count = es_client.count(index=index_name)
@@ -275,6 +743,19 @@ def upload_data_to_es(es_client, data_file, index_name, chunk_size=1000):
         import traceback
         logger.error(traceback.format_exc())
         return False
+    finally:
+        if workbook is not None:
+            workbook.close()
+
+def positive_int(value):
+    """argparse类型函数：解析为不小于1的整数"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效的整数: {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"必须为不小于1的整数: {value}")
+    return number
 
 def main():
     # 获取脚本所在目录
@@ -286,7 +767,7 @@ def main():
     
     # 命令行参数解析
     parser = argparse.ArgumentParser(description="将Excel数据上传到华为云ElasticSearch服务")
-    parser.add_argument("--data", "-d", help=f"要上传的Excel文件路径 (默认: {default_data_file})",
+    parser.add_argument("--data", "-d", help=f"要上传的Excel或Parquet文件路径 (默认: {default_data_file})",
                         default=default_data_file)
     parser.add_argument("--host", help="华为云ElasticSearch主机地址", required=True)
     parser.add_argument("--port", help="华为云ElasticSearch端口 (默认: 9200)", type=int, default=9200)
@@ -295,6 +776,14 @@ def main():
     parser.add_argument("--index", help="ElasticSearch索引名称 (默认: products)", default="products")
     parser.add_argument("--no-ssl", help="不使用SSL连接", action="store_true")
     parser.add_argument("--chunk-size", help="批量上传的大小 (默认: 1000)", type=int, default=1000)
+    parser.add_argument("--threads", help=f"并行上传的线程数 (默认: {DEFAULT_THREAD_COUNT})", type=positive_int,
+                        default=DEFAULT_THREAD_COUNT)
+    parser.add_argument("--max-chunk-bytes", help=f"单个批量请求的最大字节数 (默认: {DEFAULT_MAX_CHUNK_BYTES})",
+                        type=int, default=DEFAULT_MAX_CHUNK_BYTES)
+    parser.add_argument("--fast-load", help="上传期间关闭索引刷新和副本，完成后恢复原设置", action="store_true")
+    parser.add_argument("--mode", help="写入模式: index 覆盖写入, create 只写入新文档, "
+                        "upsert-if-changed 只写入内容有变化的文档 (默认: index)",
+                        choices=BULK_MODES, default="index")
     
     args = parser.parse_args()
     
@@ -307,7 +796,8 @@ def main():
         args.port,
         args.username,
         args.password,
-        not args.no_ssl
+        not args.no_ssl,
+        args.threads
     )
     
     if es_client:
@@ -316,7 +806,11 @@ def main():
             es_client,
             args.data,
             args.index,
-            args.chunk_size
+            args.chunk_size,
+            args.threads,
+            args.max_chunk_bytes,
+            args.fast_load,
+            args.mode
         )
     else:
         logger.error("无法连接到华为云ElasticSearch服务，上传操作终止")